@@ -1,5 +1,4 @@
 """Track LEO-sats with a custom time windows """
-import multiprocessing as mp
 import time
 from configparser import ConfigParser, ExtendedInterpolation
 
@@ -76,17 +75,19 @@ if __name__ == "__main__":
     )
 
     number_processes = parser.getint("configuration", "processes")
+    chunksize = parser.getint("configuration", "chunksize", fallback=0)
+    pin_processes = parser.getboolean(
+        "configuration", "pin_processes", fallback=False
+    )
 
     visible_satellites = parser.get("observation", "satellites")
     visible_satellites = visible_satellites.split("\n")
     print(output_directory)
     # import sys
     # sys.exit()
-    with mp.Pool(processes=number_processes) as pool:
-        results = pool.map(
-            compute_visibility.compute_visibility_of_satellite,
-            visible_satellites,
-        )
+    results = compute_visibility.compute_visibility_of_satellites(
+        visible_satellites, number_processes, chunksize, pin_processes
+    )
     ##########################################################################
     output = OutputFile(results, output_directory)
     details_name = parser.get("file", "complete")
@@ -1,4 +1,5 @@
 """Handle output file of visible LEO-satellites"""
+import numpy as np
 import pandas as pd
 
 from leosTrack.utils.filedir import FileDirectory
@@ -77,9 +78,7 @@ class OutputFile(FileDirectory):
             file_name: name of file
         """
 
-        data_frame = pd.DataFrame(
-            columns=COLUMN_NAMES_SIMPLE, data=self.simple_data
-        )
+        data_frame = self.simple_data.copy()
         #######################################################################
         # Change output format in compute visible to avoid this line of code
 
@@ -114,7 +113,7 @@ class OutputFile(FileDirectory):
             file_name: name of file
         """
 
-        data_frame = pd.DataFrame(columns=COLUMN_NAMES, data=self.data)
+        data_frame = self.data.copy()
         #######################################################################
         data_frame = data_frame.dropna()
         #######################################################################
@@ -134,24 +133,26 @@ class OutputFile(FileDirectory):
     ###########################################################################
     def _get_data(self) -> None:
         """
-        Gets list of data from visible satellites.
-        Example: self.data = [[satelite, data, data],....]
+        Gets data frames of all visible satellites, concatenated once.
+        Example: self.data -> rows of [satellite, data, data, ...]
         """
 
         visible_satellites = self._get_visible_satellites(self.results)
 
-        self.data = []
-        self.simple_data = []
-
-        for visible_satellite in visible_satellites:
-
-            # One satellite appears more than once depending on time_step
-            for visible in visible_satellite:
+        if len(visible_satellites) == 0:
 
-                [satellite, data, simple_data] = visible
+            self.data = pd.DataFrame(columns=COLUMN_NAMES)
+            self.simple_data = pd.DataFrame(columns=COLUMN_NAMES_SIMPLE)
 
-                self.data.append([satellite] + data)
-                self.simple_data.append([satellite] + simple_data)
+            return
+        # One satellite appears more than once depending on time_step
+        self.data = pd.concat(
+            [data for data, _ in visible_satellites], ignore_index=True
+        )
+        self.simple_data = pd.concat(
+            [simple_data for _, simple_data in visible_satellites],
+            ignore_index=True,
+        )
 
     ###########################################################################
     @staticmethod
@@ -161,68 +162,109 @@ class OutputFile(FileDirectory):
 
         PARAMETERS
             results: list from parallel computation.
-                Visible satellites are a list, non visible is None
+                Visible satellites are a tuple of (data, simple_data)
+                data frames, non visible is the satellite name or None
 
         OUTPUTS
             returns list with visible satellites
         """
 
-        # visible satellites come as a list
-        visible_satellites = filter(lambda x: isinstance(x, list), results)
+        # visible satellites come as a tuple
+        visible_satellites = filter(lambda x: isinstance(x, tuple), results)
 
         return list(visible_satellites)
 
 
 ###############################################################################
 def data_formating(
-    date_time,
-    satellite_lon_lat_alt: list,
+    satellite_name: str,
+    date_time: np.ndarray,
+    satellite_lon_lat_alt: np.ndarray,
     satellite_coordinates: list,
     satellite_ra_hms: list,
     satellite_dec_dms: list,
-    sun_coordinates: list,
-    sun_zenith_angle,
-    angular_velocity,
-):
+    sun_coordinates: np.ndarray,
+    sun_zenith_angle: np.ndarray,
+    angular_velocity: np.ndarray,
+) -> tuple:
     """
-    Prepare data to txt file
+    Prepare data to txt file, each row starts with the satellite name.
+    All inputs hold one entry per visible time step and are formatted
+    column by column
 
     INPUT
+    satellite_name: name of the satellite, e.g, "ONEWEB-0008"
+    date_time: array of np.datetime64
+    satellite_lon_lat_alt: [lon, lat, alt] of the satellite
     satellite_coordinates: [azimuth, altitude] of satellite
+    satellite_ra_hms: [hh, mm, ss] of satellite's RA
+    satellite_dec_dms: [dd, mm, ss] of satellite's DEC
+    sun_coordinates: [ra, dec] of the sun
+    sun_zenith_angle: sun zenith in degrees
+    angular_velocity: angular velocity of the satellite
+
+    OUTPUT
+    (data, data_simple): data frames with COLUMN_NAMES and
+        COLUMN_NAMES_SIMPLE, one row per visible time step
     """
 
-    date = f"{date_time:%Y-%m-%d}"
-    time = f"{date_time:%H:%M:%S}s"
+    # "2022-06-14T23:01:00" -> "2022-06-14", "23:01:00s"
+    date_time = np.datetime_as_string(date_time, unit="s").tolist()
 
-    satellite_ra_hms = (
-        f"{satellite_ra_hms[0]:02d}:{satellite_ra_hms[1]:02d}:"
-        f"{satellite_ra_hms[2]:05.2f}"
-    )
+    date = [step[:10] for step in date_time]
+    time = [f"{step[11:]}s" for step in date_time]
 
-    satellite_dec_dms = (
-        f"{satellite_dec_dms[0]:+03d}:{satellite_dec_dms[1]:02d}:"
-        f"{satellite_dec_dms[2]:05.2f}"
-    )
+    satellite_ra_hms = [
+        f"{hours:02d}:{minutes:02d}:{seconds:05.2f}"
+        for hours, minutes, seconds in zip(
+            *[entry.tolist() for entry in satellite_ra_hms]
+        )
+    ]
+
+    satellite_dec_dms = [
+        f"{degrees:+03d}:{minutes:02d}:{seconds:05.2f}"
+        for degrees, minutes, seconds in zip(
+            *[entry.tolist() for entry in satellite_dec_dms]
+        )
+    ]
+
+    satellite_name = [satellite_name] * len(date)
 
     data = [
-        f"{date}",
-        f"{time}",
-        f"{satellite_lon_lat_alt[0]:9.6f}",
-        f"{satellite_lon_lat_alt[1]:9.6f}",
-        f"{satellite_lon_lat_alt[2]:5.2f}",
-        f"{satellite_coordinates[0]:06.3f}",
-        f"{satellite_coordinates[1]:06.3f}",
+        satellite_name,
+        date,
+        time,
+        _format_column(satellite_lon_lat_alt[0], "9.6f"),
+        _format_column(satellite_lon_lat_alt[1], "9.6f"),
+        _format_column(satellite_lon_lat_alt[2], "5.2f"),
+        _format_column(satellite_coordinates[0], "06.3f"),
+        _format_column(satellite_coordinates[1], "06.3f"),
+        satellite_ra_hms,
+        satellite_dec_dms,
+        _format_column(sun_coordinates[0], "09.7f"),
+        _format_column(sun_coordinates[1], "09.7f"),
+        _format_column(sun_zenith_angle, "07.3f"),
+        _format_column(angular_velocity, "08.3f"),
+    ]
+
+    data_simple = [
+        satellite_name,
+        date,
+        time,
         satellite_ra_hms,
         satellite_dec_dms,
-        f"{sun_coordinates[0]:09.7f}",
-        f"{sun_coordinates[1]:09.7f}",
-        f"{sun_zenith_angle:07.3f}",
-        f"{angular_velocity:08.3f}",
     ]
 
-    data_simple = [f"{date}", f"{time}", satellite_ra_hms, satellite_dec_dms]
+    return (
+        pd.DataFrame(dict(zip(COLUMN_NAMES, data))),
+        pd.DataFrame(dict(zip(COLUMN_NAMES_SIMPLE, data_simple))),
+    )
+
+
+def _format_column(values: np.ndarray, format_spec: str) -> list:
+    """Format each value of a column with format_spec, e.g, 9.6f"""
 
-    return data, data_simple
+    return [format(value, format_spec) for value in values.tolist()]
 
 
 ###############################################################################
@@ -1,13 +1,25 @@
 """Handle operations with TLE file"""
 import datetime
+import os
 import re
-import urllib.request
+
+import requests
+from requests.adapters import HTTPAdapter
 
 from leosTrack.utils.filedir import FileDirectory
 
 ###############################################################################
 # CONSTANTS
 TLE_URL = "https://celestrak.com/NORAD/elements/supplemental"
+# name of the satellite in the first line of each tle entry
+SATELLITE_NAME_PATTERN = re.compile(
+    r"[a-zA-Z ][a-zA-Z1-9]?.*[)]"
+    r"|"
+    r"[a-zA-Z ][a-zA-Z1-9]?.*[0-9a-zA-Z]"
+)
+# session shared by all downloads to keep connections alive
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
 ###############################################################################
 
 
@@ -15,6 +27,11 @@ class TLE(FileDirectory):
 
     """Handle operations with TLE file"""
 
+    # compiled patterns to get satellites from a tle file, one per brand
+    _PATTERN_CACHE = {}
+    # tle lines of satellites per file, check get_tle_lines_of_satellites
+    _TLE_LINES_CACHE = {}
+
     def __init__(self, satellite_brand: str, tle_directory: str):
         """
         Handles tle files
@@ -51,25 +68,16 @@ class TLE(FileDirectory):
 
         updated_tle = ""
 
-        regular_expression = (
-            r"[a-zA-Z ][a-zA-Z1-9]?.*[)]"
-            r"|"
-            r"[a-zA-Z ][a-zA-Z1-9]?.*[0-9a-zA-Z]"
-        )
-
-        pattern = re.compile(regular_expression)
-
         for idx, tle_line in enumerate(tle_file_lines):
 
 
             if idx % 3 == 0:
 
-                satellite = pattern.findall(tle_line)[0]
+                satellite = SATELLITE_NAME_PATTERN.search(tle_line).group()
 
                 sat_id = f"{idx//3:04d}"
 
-                tle_line = re.sub(
-                    regular_expression,
+                tle_line = SATELLITE_NAME_PATTERN.sub(
                     f"{satellite}-ID-{sat_id}",
                     tle_line,
                     1
@@ -90,6 +98,10 @@ class TLE(FileDirectory):
         Downloads the tle_file pass in the costructor from
         TLE_URL = f"https://celestrak.com/NORAD/elements/supplemental"
 
+        The ETag of the download is saved in the tle directory. If the
+        file did not change on the server since the last download, the
+        previous file is used and nothing else is downloaded.
+
         OUTPUTS
             string with name of the tle file in the format
                 "tle_{satellite_brand}_{time_stamp}.txt".
@@ -99,17 +111,74 @@ class TLE(FileDirectory):
 
         tle_query = f"{TLE_URL}/{self.satellite_brand}.txt"
 
-        time_stamp = self.get_time_stamp()
-        tle_file_name = f"tle_{self.satellite_brand}_{time_stamp}.txt"
-
         super().check_directory(directory=self.directory)
+        #######################################################################
+        # [etag, tle_file_name, time_stamp] of the last download
+        etag_location = f"{self.directory}/tle_{self.satellite_brand}.etag"
+        last_download = self._get_last_download(etag_location)
 
-        urllib.request.urlretrieve(
-            tle_query, f"{self.directory}/{tle_file_name}"
-        )
+        headers = {}
+
+        if last_download is not None:
+            headers["If-None-Match"] = last_download[0]
+        #######################################################################
+        with SESSION.get(
+            tle_query, headers=headers, stream=True, timeout=60
+        ) as response:
+
+            if response.status_code == 304:
+
+                print("TLE file did not change since last download")
+
+                return last_download[1], last_download[2]
+
+            response.raise_for_status()
+
+            time_stamp = self.get_time_stamp()
+            tle_file_name = f"tle_{self.satellite_brand}_{time_stamp}.txt"
+
+            with open(f"{self.directory}/{tle_file_name}", "wb") as file:
+
+                for chunk in response.iter_content(chunk_size=65536):
+                    file.write(chunk)
+
+            etag = response.headers.get("ETag")
+        #######################################################################
+        if etag is not None:
+
+            with open(etag_location, "w", encoding="utf8") as file:
+                file.write(f"{etag}\n{tle_file_name}\n{time_stamp}\n")
 
         return tle_file_name, time_stamp
 
+    def _get_last_download(self, etag_location: str) -> list:
+        """
+        Read ETag, name and time stamp of the last tle file downloaded
+
+        INPUT
+            etag_location: path of the file written by download
+
+        OUTPUTS
+            [etag, tle_file_name, time_stamp] or None if there is no
+                previous download or its tle file is not available
+        """
+
+        if self.file_exists(etag_location) is False:
+            return None
+
+        with open(etag_location, "r", encoding="utf8") as file:
+            last_download = file.read().splitlines()
+
+        if len(last_download) != 3:
+            return None
+
+        tle_file_name = last_download[1]
+
+        if os.path.isfile(f"{self.directory}/{tle_file_name}") is False:
+            return None
+
+        return last_download
+
     def get_satellites_from_tle(self, file_location: str) -> list:
         """
         Retrieves the names of satellites present in tle file.
@@ -128,32 +197,87 @@ class TLE(FileDirectory):
         # oneweb -> ONEWEB
         satellite = self.satellite_brand.upper()
 
-        if satellite == "ALL":
+        pattern = self._get_satellites_pattern(satellite)
 
-            regular_expression = (
-                r"\n[a-zA-Z ][a-zA-Z1-9]?.*[)][-]ID[-][0-9]*"
-                r"|"
-                r"\n[a-zA-Z ][a-zA-Z1-9]?.*[0-9a-zA-Z][-]ID[-][0-9]*"
-            )
+        with open(f"{file_location}", "r", encoding="utf-8") as tle:
+            content = tle.read()
 
-        else:
+        satellites = pattern.findall(content)
 
-            regular_expression = (
-                f"\n{satellite}.*[)][-]ID[-][0-9]*"
-                f"|"
-                f"\n{satellite}.*[0-9a-zA-Z][-]ID[-][0-9]*"
-            )
+        return satellites
 
-        pattern = re.compile(regular_expression)
+    @classmethod
+    def get_tle_lines_of_satellites(cls, file_location: str) -> dict:
+        """
+        Reads the tle file once and maps each satellite to its two
+        lines of orbital elements. If a satellite appears more than
+        once, the first entry is kept as pyorbital does.
+        The result is cached per file and modification time, hence a
+        file is parsed once per process unless it changes. Processes
+        of the pool inherit it from the instance of ComputeVisibility.
+
+        PARAMETERS
+            file_location: path of the tle file
+
+        RETURNS
+            dictionary with satellite names in upper case as keys
+            example: {"ONEWEB-0008-ID-0007": (line_1, line_2), ...}
+        """
+
+        FileDirectory.file_exists(file_location, exit_operation=True)
+
+        cache_key = (
+            os.path.abspath(file_location),
+            os.stat(file_location).st_mtime_ns,
+        )
+
+        if cache_key in cls._TLE_LINES_CACHE:
+            return cls._TLE_LINES_CACHE[cache_key]
 
         with open(f"{file_location}", "r", encoding="utf-8") as tle:
-            content = tle.read()
+            tle_file_lines = tle.read().splitlines()
 
-        satellites = pattern.findall(content)
-        satellites = [satellite.strip("\n") for satellite in satellites]
-        satellites = [satellite.strip() for satellite in satellites]
+        tle_lines = {}
 
-        return satellites
+        for idx in range(0, len(tle_file_lines) - 2, 3):
+
+            satellite = tle_file_lines[idx].strip().upper()
+
+            tle_lines.setdefault(
+                satellite, (tle_file_lines[idx + 1], tle_file_lines[idx + 2])
+            )
+
+        cls._TLE_LINES_CACHE[cache_key] = tle_lines
+
+        return tle_lines
+
+    @classmethod
+    def _get_satellites_pattern(cls, satellite: str) -> re.Pattern:
+        """
+        Compiled pattern matching the names of the satellites in a tle
+        file updated with update_tle_file, e.g, ONEWEB-0008-ID-0007.
+        Patterns are anchored to the start of each line, and compiled
+        once per satellite brand
+
+        PARAMETERS
+            satellite: satellite brand in upper case, e.g, ONEWEB or ALL
+
+        RETURNS
+            compiled regular expression
+        """
+
+        if satellite not in cls._PATTERN_CACHE:
+
+            if satellite == "ALL":
+                name_start = "[a-zA-Z ]"
+            else:
+                name_start = re.escape(satellite)
+
+            cls._PATTERN_CACHE[satellite] = re.compile(
+                rf"^{name_start}[^\n]*-ID-[0-9]+", re.MULTILINE
+            )
+
+        return cls._PATTERN_CACHE[satellite]
 
     @staticmethod
     def unique_satellites(satellites: list) -> list:
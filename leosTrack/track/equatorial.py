@@ -0,0 +1,346 @@
+"""Vectorized conversion of horizontal coordinates to J2000 RA and DEC"""
+import numpy as np
+from pyorbital import astronomy
+
+ARCSECOND = np.pi / (180.0 * 3600.0)
+J2000 = np.datetime64("2000-01-01T12:00:00")
+JULIAN_CENTURY = np.timedelta64(36525 * 86400, "s")
+# constant of aberration
+ABERRATION = 20.49552 * ARCSECOND
+###############################################################################
+
+
+def radec_from_azalt(
+    azimuth: np.ndarray,
+    altitude: np.ndarray,
+    sin_latitude: float,
+    cos_latitude: float,
+    local_sidereal_time: np.ndarray,
+    apparent_to_j2000_transform: list,
+    pressure: float,
+    temperature: float,
+) -> list:
+    """
+    Compute J2000 astrometric RA and DEC of directions given in the
+    horizontal frame of an observer, as ephem.Observer.radec_of does
+    one time step at a time. Agreement with ephem is below one arcsec
+
+    INPUTS
+        azimuth: in [radians], one per time step
+        altitude: in [radians], one per time step
+        sin_latitude: sine of the geodetic latitude of the observer
+        cos_latitude: cosine of the geodetic latitude of the observer
+        local_sidereal_time: in [radians], one per time step, check
+            get_local_sidereal_time. It only depends on time, hence it
+            can be computed once for many satellites
+        apparent_to_j2000_transform: [rotation, earth_velocity] for
+            each time step or for all of them, check
+            get_apparent_to_j2000_transform
+        pressure: atmospheric pressure in [mbar], 0 for no refraction
+        temperature: in [Celsius]
+
+    OUTPUTS
+        [right_ascension, declination]: in [radians], one per time step
+    """
+
+    if pressure > 0:
+        altitude = unrefract_altitude(altitude, pressure, temperature)
+
+    right_ascension, declination = horizontal_to_apparent(
+        azimuth, altitude, sin_latitude, cos_latitude, local_sidereal_time
+    )
+
+    return apparent_to_j2000(
+        right_ascension, declination, apparent_to_j2000_transform
+    )
+
+
+def unrefract_altitude(
+    altitude: np.ndarray, pressure: float, temperature: float
+) -> np.ndarray:
+    """
+    Remove atmospheric refraction from apparent altitudes with the
+    same formulas of libastro, the library behind ephem. Both formulas
+    are blended between 14.5 and 15.5 degrees
+
+    INPUTS
+        altitude: apparent altitude in [radians]
+        pressure: atmospheric pressure in [mbar]
+        temperature: in [Celsius]
+
+    OUTPUTS
+        altitude: true altitude in [radians]
+    """
+
+    altitude_degree = np.rad2deg(altitude)
+    scale = pressure / (273.0 + temperature)
+    # below 15 degrees, refraction in degrees
+    numerator = (2e-5 * altitude_degree + 1.96e-2) * altitude_degree
+    numerator += 0.1594
+    denominator = (8.45e-2 * altitude_degree + 5.05e-1) * altitude_degree
+    denominator += 1.0
+
+    low_altitude = altitude - np.deg2rad(numerator / denominator * scale)
+    # above 15 degrees
+    high_altitude = altitude - 7.888888e-5 * scale / np.tan(altitude)
+
+    weight = np.clip(altitude_degree - 14.5, 0.0, 1.0)
+
+    return low_altitude + weight * (high_altitude - low_altitude)
+
+
+def get_nutation(date_time: np.ndarray) -> list:
+    """
+    Nutation in longitude and obliquity with the main terms of the
+    IAU 1980 series, accurate to about half an arcsec
+
+    INPUTS
+        date_time: array of np.datetime64 with the time steps
+
+    OUTPUTS
+        [nutation_longitude, nutation_obliquity, mean_obliquity]
+            in [radians], one per time step
+    """
+
+    centuries = (date_time - J2000) / JULIAN_CENTURY
+    # longitude of the ascending node of the moon and mean longitudes
+    # of the sun and the moon
+    node = np.deg2rad(125.04452 - 1934.136261 * centuries)
+    sun = np.deg2rad(280.4665 + 36000.7698 * centuries)
+    moon = np.deg2rad(218.3165 + 481267.8813 * centuries)
+
+    nutation_longitude = ARCSECOND * (
+        -17.20 * np.sin(node)
+        - 1.32 * np.sin(2.0 * sun)
+        - 0.23 * np.sin(2.0 * moon)
+        + 0.21 * np.sin(2.0 * node)
+    )
+
+    nutation_obliquity = ARCSECOND * (
+        9.20 * np.cos(node)
+        + 0.57 * np.cos(2.0 * sun)
+        + 0.10 * np.cos(2.0 * moon)
+        - 0.09 * np.cos(2.0 * node)
+    )
+
+    mean_obliquity = ARCSECOND * (
+        84381.448
+        - 46.8150 * centuries
+        - 0.00059 * centuries**2
+        + 0.001813 * centuries**3
+    )
+
+    return [nutation_longitude, nutation_obliquity, mean_obliquity]
+
+
+def get_local_sidereal_time(
+    date_time: np.ndarray, longitude: float
+) -> np.ndarray:
+    """
+    Local apparent sidereal time
+
+    INPUTS
+        date_time: array of np.datetime64 with the time steps
+        longitude: longitude of the observer in [radians]
+
+    OUTPUTS
+        local_sidereal_time: in [radians], one per time step
+    """
+
+    [
+        nutation_longitude,
+        nutation_obliquity,
+        mean_obliquity,
+    ] = get_nutation(date_time)
+    # equation of the equinoxes
+    equinoxes = nutation_longitude * np.cos(
+        mean_obliquity + nutation_obliquity
+    )
+
+    return astronomy.gmst(date_time) + longitude + equinoxes
+
+
+def horizontal_to_apparent(
+    azimuth: np.ndarray,
+    altitude: np.ndarray,
+    sin_latitude: float,
+    cos_latitude: float,
+    local_sidereal_time: np.ndarray,
+) -> list:
+    """
+    Rotate horizontal coordinates to apparent RA and DEC of date
+
+    INPUTS
+        azimuth: in [radians], measured from north towards east
+        altitude: in [radians]
+        sin_latitude: sine of the geodetic latitude of the observer
+        cos_latitude: cosine of the geodetic latitude of the observer
+        local_sidereal_time: in [radians], one per time step
+
+    OUTPUTS
+        [right_ascension, declination]: in [radians]
+    """
+
+    sin_altitude = np.sin(altitude)
+    cos_altitude = np.cos(altitude)
+    cos_azimuth = np.cos(azimuth)
+
+    sin_declination = sin_altitude * sin_latitude
+    sin_declination += cos_altitude * cos_latitude * cos_azimuth
+
+    declination = np.arcsin(sin_declination)
+
+    hour_angle = np.arctan2(
+        -np.sin(azimuth) * cos_altitude,
+        sin_altitude * cos_latitude
+        - cos_altitude * sin_latitude * cos_azimuth,
+    )
+
+    right_ascension = local_sidereal_time - hour_angle
+
+    return [right_ascension, declination]
+
+
+def get_apparent_to_j2000_transform(date_time: np.ndarray) -> list:
+    """
+    Earth's velocity for annual aberration and the rotation removing
+    nutation and precession (IAU 1976) from coordinates of date.
+    Both change slowly, less than 0.02 arcsec of RA and DEC in half
+    an hour, hence they can be computed on a coarse time grid
+
+    INPUTS
+        date_time: np.datetime64 or array of them
+
+    OUTPUTS
+        [rotation, earth_velocity]: arrays with shapes
+            date_time.shape + (3, 3) and date_time.shape + (3,),
+            earth_velocity in units of the speed of light
+    """
+
+    [
+        nutation_longitude,
+        nutation_obliquity,
+        mean_obliquity,
+    ] = get_nutation(date_time)
+
+    true_obliquity = mean_obliquity + nutation_obliquity
+    #######################################################################
+    # annual aberration with earth's velocity of a circular orbit
+    sun_longitude = astronomy.sun_ecliptic_longitude(date_time)
+
+    earth_velocity = ABERRATION * np.stack(
+        [
+            np.sin(sun_longitude),
+            -np.cos(sun_longitude) * np.cos(true_obliquity),
+            -np.cos(sun_longitude) * np.sin(true_obliquity),
+        ],
+        axis=-1,
+    )
+    #######################################################################
+    # true equator and equinox of date to mean of date
+    nutation = _rotation(0, -mean_obliquity)
+    nutation = nutation @ _rotation(2, nutation_longitude)
+    nutation = nutation @ _rotation(0, true_obliquity)
+    #######################################################################
+    # mean of date to J2000, transpose of the precession matrix
+    centuries = (date_time - J2000) / JULIAN_CENTURY
+
+    zeta = ARCSECOND * (
+        2306.2181 * centuries
+        + 0.30188 * centuries**2
+        + 0.017998 * centuries**3
+    )
+    z = ARCSECOND * (
+        2306.2181 * centuries
+        + 1.09468 * centuries**2
+        + 0.018203 * centuries**3
+    )
+    theta = ARCSECOND * (
+        2004.3109 * centuries
+        - 0.42665 * centuries**2
+        - 0.041833 * centuries**3
+    )
+
+    precession = _rotation(2, -z) @ _rotation(1, theta)
+    precession = precession @ _rotation(2, -zeta)
+    #######################################################################
+    rotation = np.swapaxes(precession, -1, -2) @ nutation
+
+    return [rotation, earth_velocity]
+
+
+def apparent_to_j2000(
+    right_ascension: np.ndarray,
+    declination: np.ndarray,
+    apparent_to_j2000_transform: list,
+) -> list:
+    """
+    Remove annual aberration, nutation and precession from apparent
+    RA and DEC of date
+
+    INPUTS
+        right_ascension: apparent RA of date in [radians]
+        declination: apparent DEC of date in [radians]
+        apparent_to_j2000_transform: [rotation, earth_velocity], check
+            get_apparent_to_j2000_transform
+
+    OUTPUTS
+        [right_ascension, declination]: J2000 RA in [0, 2pi) and DEC,
+            both in [radians]
+    """
+
+    rotation, earth_velocity = apparent_to_j2000_transform
+
+    direction = np.stack(
+        [
+            np.cos(declination) * np.cos(right_ascension),
+            np.cos(declination) * np.sin(right_ascension),
+            np.sin(declination),
+        ],
+        axis=-1,
+    )
+    #######################################################################
+    direction_dot_velocity = np.sum(
+        direction * earth_velocity, axis=-1, keepdims=True
+    )
+
+    direction = direction - earth_velocity + direction_dot_velocity * direction
+    direction /= np.linalg.norm(direction, axis=-1, keepdims=True)
+    #######################################################################
+    direction = np.einsum("...ij,...j->...i", rotation, direction)
+
+    right_ascension = np.mod(
+        np.arctan2(direction[..., 1], direction[..., 0]), 2.0 * np.pi
+    )
+    declination = np.arcsin(np.clip(direction[..., 2], -1.0, 1.0))
+
+    return [right_ascension, declination]
+
+
+def _rotation(axis: int, angle: np.ndarray) -> np.ndarray:
+    """
+    Matrices rotating the coordinate frame by angle around an axis
+
+    INPUTS
+        axis: 0, 1 or 2 for x, y or z
+        angle: in [radians]
+
+    OUTPUTS
+        rotation: array with shape angle.shape + (3, 3)
+    """
+
+    angle = np.asarray(angle)
+
+    rotation = np.zeros(angle.shape + (3, 3))
+    rotation[..., axis, axis] = 1.0
+
+    first, second = [idx for idx in range(3) if idx != axis]
+    # axes in cyclic order are (y, z), (z, x) and (x, y)
+    sign = -1.0 if axis == 1 else 1.0
+
+    rotation[..., first, first] = np.cos(angle)
+    rotation[..., second, second] = np.cos(angle)
+    rotation[..., first, second] = sign * np.sin(angle)
+    rotation[..., second, first] = -sign * np.sin(angle)
+
+    return rotation
@@ -1,17 +1,133 @@
 """Compute visibility of LEO sats according to observation constraints"""
+import abc
 import datetime
+import functools
+import math
+import multiprocessing as mp
+import os
+import sys
 
 import ephem
 import numpy as np
-from pyorbital.orbital import Orbital
-
+from pyorbital import astronomy
+from pyorbital.orbital import Orbital, OrbitalError
+from pyorbital.tlefile import ChecksumError
+
+from leosTrack import output
+from leosTrack.tle import TLE
+from leosTrack.track.equatorial import (
+    get_apparent_to_j2000_transform,
+    get_local_sidereal_time,
+    radec_from_azalt,
+)
 from leosTrack.units import ConvertUnits
 
 ###############################################################################
 CONVERT = ConvertUnits()
+# the sun moves less than 1.5 degrees in this time, its zenith angle is
+# computed with this time resolution and interpolated at the time steps
+SUN_TIME_DELTA = datetime.timedelta(minutes=5)
+# aberration, nutation and precession are computed with this time
+# resolution, each time step uses the closest one
+TRANSFORM_TIME_DELTA = datetime.timedelta(hours=1)
+# ephem dates are float days since this epoch (Dublin Julian Day)
+EPHEM_EPOCH = np.datetime64("1899-12-31T12:00:00")
+# atmosphere at the observatory to remove refraction from altitudes
+PRESSURE = 1010  # mbar
+TEMPERATURE = 15  # Celsius
+###############################################################################
+
+
+@functools.lru_cache(maxsize=8)
+def get_sun_ephemeris_of_days(
+    first_day: datetime.date, last_day: datetime.date
+) -> tuple:
+    """
+    Sun RA, DEC and Greenwich mean sidereal time every SUN_TIME_DELTA
+    from the start of first_day to the end of last_day in UTC. These
+    only depend on time, hence they are cached and shared by all the
+    observatories and satellites computed in the same process
+
+    INPUTS
+        first_day: first UTC day of the observation window
+        last_day: last UTC day of the observation window
+
+    OUTPUTS
+        (sun_date_time, sun_right_ascension, sun_declination, gmst)
+            sun_date_time: array of np.datetime64
+            sun_right_ascension: in [radians]
+            sun_declination: in [radians]
+            gmst: in [radians]
+    """
+
+    sun_time_delta = np.timedelta64(SUN_TIME_DELTA)
+
+    sun_date_time = np.arange(
+        np.datetime64(first_day),
+        np.datetime64(last_day + datetime.timedelta(days=1)) + sun_time_delta,
+        sun_time_delta,
+    )
+
+    sun_right_ascension, sun_declination = astronomy.sun_ra_dec(sun_date_time)
+    gmst = astronomy.gmst(sun_date_time)
+
+    sun_ephemeris = (sun_date_time, sun_right_ascension, sun_declination, gmst)
+    # cached arrays are shared, avoid modifying them by accident
+    for array in sun_ephemeris:
+        array.flags.writeable = False
+
+    return sun_ephemeris
+
+
+###############################################################################
+# instance of ComputeVisibility shared by the tasks of each pool process
+WORKER_COMPUTE_VISIBILITY = None
+
+
+def _init_worker(compute_visibility, pin_processes: bool) -> None:
+    """
+    Initializer of the pool processes. It keeps the instance of
+    ComputeVisibility in the process, then the instance is neither
+    serialized nor set up again per satellite
+
+    INPUTS
+        compute_visibility: instance of ComputeVisibility
+        pin_processes: if True, pin the process to a cpu on linux
+    """
+
+    global WORKER_COMPUTE_VISIBILITY
+
+    if pin_processes is True and sys.platform.startswith("linux"):
+        _pin_worker_to_cpu()
+
+    WORKER_COMPUTE_VISIBILITY = compute_visibility
+
+
+def _pin_worker_to_cpu() -> None:
+    """
+    Pin the process of the pool to one of the available cpus, one per
+    process in turns, so that it is not moved between cpus and keeps
+    its arrays in the same cache
+    """
+
+    cpus = sorted(os.sched_getaffinity(0))
+    # processes are numbered from 1 by a counter of the parent process
+    # that keeps counting across pools, hence the modulo
+    process = mp.current_process()
+    worker_idx = process._identity[0] - 1  # pylint: disable=protected-access
+
+    os.sched_setaffinity(0, {cpus[worker_idx % len(cpus)]})
+
+
+def _compute_visibility_of_satellite_in_worker(satellite_name: str) -> tuple:
+    """Task of the pool, check compute_visibility_of_satellite"""
+
+    return WORKER_COMPUTE_VISIBILITY.compute_visibility_of_satellite(
+        satellite_name
+    )
 
 
-class ComputeVisibility:
+class ComputeVisibility(abc.ABC):
     """Class to compute whether a satellite is visible or not"""
 
     def __init__(
@@ -19,7 +135,8 @@ class ComputeVisibility:
         time_parameters: dict,
         observatory_data: dict,
         observation_constraints: dict,
-        tle_file_location: str,
+        tle_file_location: str = None,
+        validate_ra_dec: bool = False,
     ):
         """
         INPUTS
@@ -69,7 +186,15 @@ class ComputeVisibility:
                 'sun_zenith_highest': 114 # degree
             }
 
-            tle_file_location: path to tle file used to compute visibility
+            tle_file_location: path to tle file used to compute visibility.
+                If None, it must be set with set_tle_lines before the
+                visibility is computed
+
+            validate_ra_dec: debug flag, if True, RA and DEC of visible
+                satellites are also computed with ephem.Observer.radec_of
+                and the largest separation is printed. It is kept in
+                the instance, hence it also reaches the processes of
+                the pool, e.g, FixWindow(..., validate_ra_dec=True)
         """
         #######################################################################
 
@@ -78,36 +203,289 @@ class ComputeVisibility:
         self.time_delta = datetime.timedelta(seconds=time_parameters["delta"])
 
         self.observatory_data = self.set_observatory_data(observatory_data)
+        # the observatory location is constant, hence its trigonometry
+        # is shared by all the coordinate conversions
+        latitude = math.radians(self.observatory_data["latitude"])
+        self.sin_latitude = math.sin(latitude)
+        self.cos_latitude = math.cos(latitude)
+        self.longitude = math.radians(self.observatory_data["longitude"])
         self.constraints = observation_constraints
-        self.tle_file_location = tle_file_location
+        # bounds of the visibility checks are cast once to floats, the
+        # configuration file parser leaves e.g. negative values as str
+        self.lowest_altitude_satellite = float(
+            observation_constraints["lowest_altitude_satellite"]
+        )
+        self.sun_zenith_lowest = float(
+            observation_constraints["sun_zenith_lowest"]
+        )
+        self.sun_zenith_highest = float(
+            observation_constraints["sun_zenith_highest"]
+        )
+        self.tle_file_location = None
+        self.tle_lines = None
+
+        if tle_file_location is not None:
+            self.set_tle_lines(tle_file_location)
+
+        self.validate_ra_dec = validate_ra_dec
         self.observer = None
         # self._set_observer()
+        #######################################################################
+        # time steps and sun zenith are the same for all satellites,
+        # hence they are computed once here
+        self.date_time = None
+        self.sun_zenith = None
+        self.sun_coordinates = None
+        self.local_sidereal_time = None
+        self.apparent_to_j2000_transform = None
+        self.propagation_time_steps = None
+        self._set_time_steps()
+
+    def __getstate__(self) -> dict:
+        """
+        ephem.Observer cannot be serialized, hence it is left out when
+        the instance is sent to the processes of the pool. It is only
+        needed to validate RA and DEC with ephem, and it is set lazily
+        when it is None, check get_satellite_ra_dec_with_ephem
+        """
+
+        state = self.__dict__.copy()
+        state["observer"] = None
+
+        return state
+
+    def compute_visibility_of_satellites(
+        self,
+        satellites: list,
+        number_processes: int,
+        chunksize: int = 0,
+        pin_processes: bool = False,
+    ) -> list:
+        """
+            Compute visibility of satellites in parallel. Satellites are
+            independent of each other, hence each process of the pool
+            computes the visibility of a different satellite.
+            Processes are started with spawn, hence they only get the
+            state of this instance
+
+            INPUTS
+            satellites: names of satellites in the tle file,
+                e.g, ["ONEWEB-0008-ID-0007", ...]
+            number_processes: number of processes in the pool
+            chunksize: number of satellites sent at once to a process.
+                If smaller than 1, each process gets about four chunks
+            pin_processes: if True, each process is pinned to a cpu on
+                linux, in turns over the cpus available to this process
+
+            OUTPUTS
+            results: output of compute_visibility_of_satellite for
+                each satellite, in the same order of satellites
+        """
+
+        # no satellite is visible if the sun constraint never holds
+        if self.propagation_time_steps.size == 0:
+
+            print("Sun zenith is out of bounds during the whole window")
+
+            return list(satellites)
+
+        if chunksize < 1:
+            chunksize = max(1, len(satellites) // (4 * number_processes))
+
+        with mp.get_context("spawn").Pool(
+            processes=number_processes,
+            initializer=_init_worker,
+            initargs=(self, pin_processes),
+        ) as pool:
+
+            results = list(
+                pool.imap(
+                    _compute_visibility_of_satellite_in_worker,
+                    satellites,
+                    chunksize=chunksize,
+                )
+            )
+
+        return results
+
+    def compute_visibility_of_satellite(self, satellite_name: str) -> tuple:
+        """
+            Compute visibility of a satellite over the whole observation
+            window at once with arrays of time steps
+
+            PARAMETERS
+            satellite_name: name of a satellite, eg, "ONEWEB-0008"
+
+            OUTPUT
+            tuple with (data, simple_data) data frames of the visible
+            satellite, check output.data_formating, or satellite_name
+            if the satellite is not visible
+        """
+
+        satellite = self._set_dark_satellite(satellite_name)
+
+        if satellite is None:
+            return satellite_name
+
+        # time steps and sun zenith are shared by all satellites
+        date_time = self.date_time
+        sun_zenith = self.sun_zenith
+        #######################################################################
+        print(f"Compute visibility of: {satellite_name}", end="\r")
+        #######################################################################
+        # the orbit is only propagated at time steps where the sun
+        # constraint holds, check _set_time_steps
+        propagation_time_steps = self.propagation_time_steps
+
+        if propagation_time_steps.size == 0:
+            return satellite_name
+        # time steps without propagation are np.nan
+        satellite_azimuth = np.full(date_time.size, np.nan)
+        satellite_altitude = np.full(date_time.size, np.nan)
+        # pyorbital handles arrays of time steps, therefore the look
+        # angles are computed once for the whole observation window.
+        # They come straight from the SGP4 position, without the
+        # satellite's lon, lat and alt, which are only needed for
+        # visible time steps. Negative elevation implies satellite is
+        # under the horizon. Observer altitude must be in kilometers.
+        # If the orbit decays at any time step, pyorbital raises a
+        # bare Exception for the whole array, hence the satellite
+        # is checked once here and not at each time step
+        try:
+
+            [
+                satellite_azimuth[propagation_time_steps],
+                satellite_altitude[propagation_time_steps],
+            ] = satellite.get_observer_look(
+                date_time[propagation_time_steps],
+                self.observatory_data["longitude"],
+                self.observatory_data["latitude"],
+                self.observatory_data["altitude"] / 1000.0,
+            )
+
+        except Exception as error:  # pylint: disable=broad-except
+
+            print(f"{satellite_name} cannot be propagated: {error}")
+
+            return satellite_name
+        #######################################################################
+        # np.nan fails all comparisons, hence time steps without
+        # propagation or with non finite coordinates are not visible
+        satellite_visibility = self.check_visibility(
+            satellite_altitude[1:], sun_zenith[1:]
+        )
+        # shift by one because of the time step before the start
+        visible_time_steps = np.flatnonzero(satellite_visibility) + 1
+
+        if visible_time_steps.size == 0:
+            return satellite_name
+
+        print(f"{satellite_name} is visible", end="\r")
+        # footprint and orbital altitude of the satellite
+        satellite_lon_lat_alt = np.array(
+            satellite.get_lonlatalt(date_time[visible_time_steps])
+        )
+        #######################################################################
+        # compute the change in AZ and ALT of the satellite position
+        # between current and previous time step, only when visible
+        angular_velocity = self.angular_velocity(
+            [
+                satellite_azimuth[visible_time_steps],
+                satellite_altitude[visible_time_steps],
+            ],
+            [
+                satellite_azimuth[visible_time_steps - 1],
+                satellite_altitude[visible_time_steps - 1],
+            ],
+        )
+        #######################################################################
+        # ra and dec of the sun are shared by all satellites while the
+        # ones of the satellite are computed only when it is visible
+        sun_coordinates = self.sun_coordinates[:, visible_time_steps]
+
+        [
+            satellite_ra_hms,
+            satellite_dec_dms,
+        ] = self.get_satellite_ra_dec_from_azimuth_and_altitude(
+            date_time[visible_time_steps],
+            self.local_sidereal_time[visible_time_steps],
+            satellite_azimuth[visible_time_steps],
+            satellite_altitude[visible_time_steps],
+        )
+        #######################################################################
+        # format all visible time steps at once
+        visible_satellite_data = output.data_formating(
+            satellite_name,
+            date_time[visible_time_steps],
+            satellite_lon_lat_alt,
+            [
+                satellite_azimuth[visible_time_steps],
+                satellite_altitude[visible_time_steps],
+            ],
+            satellite_ra_hms,
+            satellite_dec_dms,
+            sun_coordinates,
+            sun_zenith[visible_time_steps],
+            angular_velocity,
+        )
+
+        return visible_satellite_data
 
     def get_satellite_ra_dec_from_azimuth_and_altitude(
-        self, satellite_azimuth: float, satellite_altitude: float
+        self,
+        date_time: np.ndarray,
+        local_sidereal_time: np.ndarray,
+        satellite_azimuth: np.ndarray,
+        satellite_altitude: np.ndarray,
     ) -> list:
         """
             Compute satellite RA [hh, mm, ss] and DEC [dd, mm, ss] using
             satellite's azimuth and altitude in degrees.
 
             INPUTS
-            satellite_azimuth: in units of [degree]
-            satellite_altitude: in units of [degree]
+            date_time: array of np.datetime64 with the time steps
+            local_sidereal_time: in [radians], one per time step
+            satellite_azimuth: in units of [degree], one per time step
+            satellite_altitude: in units of [degree], one per time step
 
             OUTPUTS
             [
                 [ra_satellite_h, ra_satellite_m, ra_satellite_s],
                 [dec_satellite_d, dec_satellite_m, dec_satellite_s]
             ]
-
+            each entry is an array with one value per time step
         """
 
-        [
-            right_ascension_satellite,
-            declination_satellite,
-        ] = self.observer.radec_of(
-            np.radians(satellite_azimuth), np.radians(satellite_altitude)
+        satellite_azimuth = np.radians(satellite_azimuth)
+        satellite_altitude = np.radians(satellite_altitude)
+        # closest transform of the coarse grid set in _set_time_steps
+        transform_idx = np.rint(
+            (date_time - self.date_time[0])
+            / np.timedelta64(TRANSFORM_TIME_DELTA)
+        ).astype(int)
+
+        rotation, earth_velocity = self.apparent_to_j2000_transform
+        # same refraction and J2000 epoch as ephem.Observer.radec_of
+        [right_ascension_satellite, declination_satellite] = radec_from_azalt(
+            satellite_azimuth,
+            satellite_altitude,
+            sin_latitude=self.sin_latitude,
+            cos_latitude=self.cos_latitude,
+            local_sidereal_time=local_sidereal_time,
+            apparent_to_j2000_transform=[
+                rotation[transform_idx],
+                earth_velocity[transform_idx],
+            ],
+            pressure=PRESSURE,
+            temperature=TEMPERATURE,
         )
+
+        if self.validate_ra_dec is True:
+            self._validate_ra_dec(
+                date_time,
+                [satellite_azimuth, satellite_altitude],
+                [right_ascension_satellite, declination_satellite],
+            )
         # convert right ascension to hh, mm, ss
         [
             ra_satellite_h,
@@ -131,45 +509,143 @@ class ComputeVisibility:
             [dec_satellite_d, dec_satellite_m, dec_satellite_s],
         ]
 
+    def get_satellite_ra_dec_with_ephem(
+        self,
+        date_time: np.ndarray,
+        satellite_azimuth: np.ndarray,
+        satellite_altitude: np.ndarray,
+    ) -> list:
+        """
+            Compute satellite RA and DEC with ephem one time step at a
+            time, used to validate the vectorized computation
+
+            INPUTS
+            date_time: array of np.datetime64 with the time steps
+            satellite_azimuth: in units of [radians], one per time step
+            satellite_altitude: in units of [radians], one per time step
+
+            OUTPUTS
+            [right_ascension, declination]: in [radians]
+        """
+
+        # ephem.Observer is not serialized with the instance, hence the
+        # observer is set here if needed, once per process of the pool
+        if self.observer is None:
+            self._set_observer()
+
+        right_ascension_satellite = np.empty(date_time.size)
+        declination_satellite = np.empty(date_time.size)
+        # convert all time steps and coordinates before the loop, ephem
+        # takes its float dates as they are, without calendar arithmetic
+        ephem_date = (date_time - EPHEM_EPOCH) / np.timedelta64(1, "D")
+        ephem_date = ephem_date.tolist()
+        satellite_azimuth = satellite_azimuth.tolist()
+        satellite_altitude = satellite_altitude.tolist()
+
+        # bind names used at every time step to locals
+        update_observer_date = self._update_observer_date
+        radec_of = self.observer.radec_of
+
+        for idx, ephem_date_step in enumerate(ephem_date):
+
+            update_observer_date(ephem_date_step)
+
+            [
+                right_ascension_satellite[idx],
+                declination_satellite[idx],
+            ] = radec_of(satellite_azimuth[idx], satellite_altitude[idx])
+
+        return [right_ascension_satellite, declination_satellite]
+
+    def _validate_ra_dec(
+        self,
+        date_time: np.ndarray,
+        satellite_coordinates: list,
+        satellite_ra_dec: list,
+    ) -> None:
+        """
+            Print largest separation between vectorized and ephem RA
+            and DEC of the satellite
+
+            INPUTS
+            date_time: array of np.datetime64 with the time steps
+            satellite_coordinates: [azimuth, altitude] in [radians]
+            satellite_ra_dec: [right_ascension, declination] in [radians]
+        """
+
+        if date_time.size == 0:
+            return
+
+        ephem_ra_dec = self.get_satellite_ra_dec_with_ephem(
+            date_time, *satellite_coordinates
+        )
+
+        right_ascension, declination = satellite_ra_dec
+        ephem_right_ascension, ephem_declination = ephem_ra_dec
+
+        cos_separation = np.sin(declination) * np.sin(ephem_declination)
+        cos_separation += (
+            np.cos(declination)
+            * np.cos(ephem_declination)
+            * np.cos(right_ascension - ephem_right_ascension)
+        )
+
+        separation = np.rad2deg(np.arccos(np.clip(cos_separation, -1, 1)))
+        separation *= 3600.0
+
+        print(
+            "RA/DEC max separation with ephem: "
+            f"{separation.max():.3f} [arcsec]"
+        )
+
     def angular_velocity(
         self,
         satellite_coordinates: list,
         previous_satellite_coordinates: list,
-    ) -> float:
+    ) -> np.ndarray:
 
         """
-            Compute the angular velocity of the satellite
+            Compute the angular velocity of the satellite. The angular
+            distance does not change with the rotation from the
+            horizontal to the equatorial frame, hence it is computed
+            from azimuth and altitude
 
             INPUTS
 
             satellite_coordinates: [azimuth in t_{n}, altitude in t_{n}]
             previous_satellite_coordinates:
                 [azimuth in t_{n-1}, altitude in t_{n-1}]
+            coordinates are in [degree], either floats or arrays with
+            one entry per time step
 
             OUTPUTS
-            angular_velocity: satellite angular velocity
+            angular_velocity: satellite angular velocity in [arcsec/sec]
         """
 
-        [
-            previous_right_ascension,
-            previous_declination,
-        ] = self.observer.radec_of(
-            np.radians(previous_satellite_coordinates[0]),
-            np.radians(previous_satellite_coordinates[1])
-        )
+        azimuth, altitude = np.radians(satellite_coordinates)
 
-        right_ascension, declination = self.observer.radec_of(
-            np.radians(satellite_coordinates[0]),
-            np.radians(satellite_coordinates[1])
+        previous_azimuth, previous_altitude = np.radians(
+            previous_satellite_coordinates
         )
 
-        dtheta = 2 * np.arcsin(
-            np.sqrt(
-                np.sin(0.5*(declination - previous_declination))**2
-                +
-                np.cos(declination) * np.cos(previous_declination) *
-                np.sin(0.5*(right_ascension-previous_right_ascension))**2
-            )
+        # Vincenty's formula, with np.hypot and np.arctan2 it is well
+        # conditioned for small and large angular distances alike
+        delta_azimuth = azimuth - previous_azimuth
+        cos_delta_azimuth = np.cos(delta_azimuth)
+
+        sin_altitude = np.sin(altitude)
+        cos_altitude = np.cos(altitude)
+        sin_previous_altitude = np.sin(previous_altitude)
+        cos_previous_altitude = np.cos(previous_altitude)
+
+        dtheta = np.arctan2(
+            np.hypot(
+                cos_altitude * np.sin(delta_azimuth),
+                cos_previous_altitude * sin_altitude
+                - sin_previous_altitude * cos_altitude * cos_delta_azimuth,
+            ),
+            sin_previous_altitude * sin_altitude
+            + cos_previous_altitude * cos_altitude * cos_delta_azimuth,
         )
         # convert from radians to arcseconds
         # 1rad × (3600 × 180)/π = 206264.806"
@@ -181,9 +657,134 @@ class ComputeVisibility:
 
         return angular_velocity
 
+    @staticmethod
+    @abc.abstractmethod
+    def get_date_time_object(time_parameters: dict, time_zone: int) -> list:
+        """
+        INPUT
+            time_parameters: check constructor
+            tz: time zone of the observatory location
+            constant_window: wheather the user defines a time window or if it
+                is the "evening" or "morning" 12 hours slot
+        OUTPUTS
+            [
+                start_date_time: datetime.datetime,
+                finish_date_time: datetime.datetime
+            ]
+        """
+
+    def get_date_time_array(
+        self,
+        start_date_time: datetime.datetime,
+        finish_date_time: datetime.datetime,
+    ) -> np.ndarray:
+        """
+            Time steps of the observation window separated by the time
+            delta defined in the constructor of the class. The first
+            entry is one time step before start_date_time, so the
+            angular velocity can be computed at the start
+
+            INPUTS
+            start_date_time: start of the observation window in UTC
+            finish_date_time: end of the observation window in UTC
+
+            OUTPUTS
+            date_time: array of np.datetime64 with the time steps
+        """
+
+        observation_window_seconds = (
+            finish_date_time - start_date_time
+        ).total_seconds()
+
+        number_of_time_steps = int(
+            observation_window_seconds / self.time_delta.total_seconds()
+        )
+
+        date_time = np.datetime64(start_date_time) + np.timedelta64(
+            self.time_delta
+        ) * np.arange(-1, number_of_time_steps)
+
+        return date_time
+
+    def get_sun_coordinates_and_zenith(self, date_time: np.ndarray) -> list:
+        """
+            Compute sun RA, DEC and zenith angle at the observatory for
+            all time steps. The zenith is derived from the same RA and
+            DEC of the cached sun ephemeris, computed every
+            SUN_TIME_DELTA, and the three are linearly interpolated at
+            the time steps
+
+            INPUTS
+            date_time: array of np.datetime64 with the time steps
+
+            OUTPUTS
+            [sun_right_ascension, sun_declination, sun_zenith]
+                sun_right_ascension: in [hours], one per time step
+                sun_declination: in [degree], one per time step
+                sun_zenith: in [degree], one per time step
+        """
+
+        [
+            sun_date_time,
+            sun_right_ascension,
+            sun_declination,
+            gmst,
+        ] = get_sun_ephemeris_of_days(
+            date_time[0].astype("datetime64[D]").item(),
+            date_time[-1].astype("datetime64[D]").item(),
+        )
+        # same expression as pyorbital.astronomy.sun_zenith_angle
+        hour_angle = gmst + self.longitude - sun_right_ascension
+
+        cos_sun_zenith = self.sin_latitude * np.sin(sun_declination)
+        cos_sun_zenith += (
+            self.cos_latitude * np.cos(sun_declination) * np.cos(hour_angle)
+        )
+
+        sun_zenith = np.rad2deg(np.arccos(cos_sun_zenith))
+        #######################################################################
+        # interpolate in seconds since the first time step, RA is
+        # unwrapped to avoid the jump from 2pi to 0
+        seconds = (date_time - date_time[0]) / np.timedelta64(1, "s")
+        sun_seconds = (sun_date_time - date_time[0]) / np.timedelta64(1, "s")
+
+        sun_right_ascension = np.interp(
+            seconds, sun_seconds, np.unwrap(sun_right_ascension)
+        )
+        sun_declination = np.interp(seconds, sun_seconds, sun_declination)
+        sun_zenith = np.interp(seconds, sun_seconds, sun_zenith)
+
+        sun_right_ascension = CONVERT.right_ascension_in_radians_to_hours(
+            right_ascension=sun_right_ascension
+        )
+        sun_declination = np.rad2deg(sun_declination)
+
+        return [sun_right_ascension, sun_declination, sun_zenith]
+
+    def check_sun_zenith(self, sun_zenith_angle: np.ndarray) -> np.ndarray:
+        """
+            Verify if the sun zenith is within the bounds defined in the
+            constraints passed to the constructor of the class. It does
+            not depend on the satellite
+
+            INPUTS
+            sun_zenith_angle: sun zenith, either a float or an array
+                with one entry per time step
+
+            OUTPUTS
+            check_sun_zenith: boolean or boolean array
+        """
+
+        check_sun_zenith = self.sun_zenith_lowest < sun_zenith_angle
+        check_sun_zenith &= sun_zenith_angle < self.sun_zenith_highest
+
+        return check_sun_zenith
+
     def check_visibility(
-        self, satellite_altitude: float, sun_zenith_angle: float
-    ) -> bool:
+        self,
+        satellite_altitude: np.ndarray,
+        sun_zenith_angle: np.ndarray,
+    ) -> np.ndarray:
 
         """
             Verify if satellite is visible according to constraints
@@ -191,32 +792,40 @@ class ComputeVisibility:
 
             INPUTS
 
-            satellite: current altitude of altitude:
-            sun_zenith_angle: current sun zenith
+            satellite_altitude: altitude of the satellite, either a
+                float or an array with one entry per time step
+            sun_zenith_angle: sun zenith with the same shape
 
             OUTPUTS
 
-            is_visible: boolean indicating if satellite is visible
-                according to observing constraints introduce in
-                the constructor of the class
+            is_visible: boolean or boolean array indicating if satellite
+                is visible according to observing constraints introduce
+                in the constructor of the class
         """
 
-        lowest_altitude_satellite = self.constraints[
-            "lowest_altitude_satellite"
-        ]
-
-        sun_zenith_highest = self.constraints["sun_zenith_highest"]
-        sun_zenith_lowest = self.constraints["sun_zenith_lowest"]
-        ###################################################################
+        check_altitude = satellite_altitude > self.lowest_altitude_satellite
+        check_sun_zenith = self.check_sun_zenith(sun_zenith_angle)
 
-        check_altitude = satellite_altitude > lowest_altitude_satellite
-        check_sun_zenith = sun_zenith_lowest < sun_zenith_angle
-        check_sun_zenith *= sun_zenith_angle < sun_zenith_highest
-        # Add bool() to avoid having np.bool_ type. This way, I can have
-        is_visible = bool(check_altitude and check_sun_zenith)
+        is_visible = check_altitude & check_sun_zenith
+        # Add bool() to avoid having np.bool_ type with scalar inputs
+        if np.ndim(is_visible) == 0:
+            is_visible = bool(is_visible)
 
         return is_visible
 
+    def set_tle_lines(self, tle_file_location: str) -> None:
+        """
+        Parse the tle file once for all the satellites. The time steps
+        do not depend on it, hence the instance can be built while the
+        tle file is still being downloaded
+
+        PARAMETERS
+            tle_file_location: path to tle file used to compute visibility
+        """
+
+        self.tle_file_location = tle_file_location
+        self.tle_lines = TLE.get_tle_lines_of_satellites(tle_file_location)
+
     def _set_dark_satellite(self, satellite: str) -> Orbital:
         """
         Set dark satellite object for orbital computations
@@ -226,13 +835,78 @@ class ComputeVisibility:
                 the tle_file provided for the computations, eg, "ONEWEB-0008"
 
         OUTPUTS
-            dark_satellite: instance of class pyorbital.orbital.Orbital
+            dark_satellite: instance of class pyorbital.orbital.Orbital,
+                None if the orbit cannot be propagated with pyorbital
 
         """
-        dark_satellite = Orbital(satellite, tle_file=self.tle_file_location)
+        [line_1, line_2] = self.tle_lines[satellite.strip().upper()]
+        # pyorbital raises these errors when the satellite is built, for
+        # orbits with periods above 225 minutes (deep space), orbital
+        # elements out of range or corrupted tle lines
+        try:
+
+            dark_satellite = Orbital(satellite, line1=line_1, line2=line_2)
+
+        except (NotImplementedError, OrbitalError, ChecksumError):
+
+            return None
 
         return dark_satellite
 
+    ###########################################################################
+    def _set_time_steps(self) -> None:
+        """
+        Set time steps of the observation window and the sun zenith,
+        RA, DEC and the local sidereal time at each of them, as well
+        as the transform from apparent RA and DEC to J2000 every
+        TRANSFORM_TIME_DELTA and the time steps where orbits are
+        propagated. These are shared by all satellites
+        """
+
+        start_date_time, finish_date_time = self.get_date_time_object(
+            time_parameters=self.time_parameters,
+            time_zone=self.observatory_data["tz"],
+        )
+
+        # the first entry is one time step before the start
+        # to compute the angular velocity
+        self.date_time = self.get_date_time_array(
+            start_date_time, finish_date_time
+        )
+
+        [
+            sun_right_ascension,
+            sun_declination,
+            self.sun_zenith,
+        ] = self.get_sun_coordinates_and_zenith(self.date_time)
+        # [ra, dec] with one column per time step
+        self.sun_coordinates = np.array([sun_right_ascension, sun_declination])
+        # the sun constraint does not depend on the satellite, therefore
+        # orbits are only propagated at time steps where it holds and
+        # at their previous time step to compute the angular velocity
+        sun_time_steps = np.flatnonzero(self.check_sun_zenith(self.sun_zenith))
+        sun_time_steps = sun_time_steps[sun_time_steps > 0]
+
+        self.propagation_time_steps = np.union1d(
+            sun_time_steps - 1, sun_time_steps
+        )
+
+        self.local_sidereal_time = get_local_sidereal_time(
+            self.date_time, self.longitude
+        )
+
+        transform_time_delta = np.timedelta64(TRANSFORM_TIME_DELTA)
+        # one extra step so that the last time step has its closest one
+        transform_date_time = np.arange(
+            self.date_time[0],
+            self.date_time[-1] + transform_time_delta,
+            transform_time_delta,
+        )
+
+        self.apparent_to_j2000_transform = get_apparent_to_j2000_transform(
+            transform_date_time
+        )
+
     ###########################################################################
     def _set_observer(self) -> None:
         """
@@ -244,14 +918,14 @@ class ComputeVisibility:
 
         observer = ephem.Observer()
         observer.epoch = "2000"
-        observer.pressure = 1010
-        observer.temp = 15
+        observer.pressure = PRESSURE
+        observer.temp = TEMPERATURE
         #######################################################################
         observatory_latitude = self.observatory_data["latitude"]  # degrees
-        observer.lat = np.radians(observatory_latitude)
+        observer.lat = math.radians(observatory_latitude)
         #######################################################################
         observatory_longitude = self.observatory_data["longitude"]  # degrees
-        observer.lon = np.radians(observatory_longitude)
+        observer.lon = math.radians(observatory_longitude)
         #######################################################################
         observer.elevation = self.observatory_data["altitude"]  # in meters
         self.observer = observer
@@ -292,26 +966,22 @@ class ComputeVisibility:
         ) in data_observatory.items():
 
             if isinstance(parameters_values, list) is True:
-                sign = 1  # negative to the west and positive to the east
-                update_format[parameter_observatory] = 0
-                ###############################################################
-                for idx, parameter in enumerate(parameters_values):
-
-                    # parameter will be in degrees, minutes and seconds
-                    # idx=0 -> degrees
-                    # idx=1 -> minutes
-                    # idx=2 -> seconds
-                    # maybe a lamda function with map?
-                    if parameter < 0:
-                        sign = -1
-                        parameter = abs(parameter)
-
-                    update_format[parameter_observatory] += parameter / (
-                        60 ** idx
-                    )
-                ###############################################################
-                update_format[parameter_observatory] = (
-                    sign * update_format[parameter_observatory]
+                # parameter will be in degrees, minutes and seconds
+                # entry 0 -> degrees
+                # entry 1 -> minutes
+                # entry 2 -> seconds
+                # the sign is the one of the degrees entry
+                degrees_minutes_seconds = np.asarray(
+                    parameters_values, dtype=float
+                )
+
+                sign = -1.0 if np.signbit(degrees_minutes_seconds[0]) else 1.0
+
+                # [1, 1/60, 1/3600] for as many entries as there are
+                weights = 60.0 ** -np.arange(degrees_minutes_seconds.size)
+
+                update_format[parameter_observatory] = sign * np.dot(
+                    np.abs(degrees_minutes_seconds), weights
                 )
 
             else:
@@ -333,7 +1003,8 @@ class ComputeVisibility:
         return update_format
 
     ###########################################################################
-    def _update_observer_date(self, date_time: datetime.datetime) -> None:
+    def _update_observer_date(self, date_time) -> None:
+        """date_time: datetime.datetime or float ephem date"""
 
         self.observer.date = ephem.date(date_time)
 
@@ -22,65 +22,66 @@ class ConvertUnits:
             right_ascension_in_hours: right_ascension in hours
 
         """
-        right_ascension_in_degrees = np.rad2deg(right_ascension)
-
-        if right_ascension_in_degrees < 0:
-            right_ascension_in_degrees += 360
+        # ufuncs work for floats and arrays alike
+        right_ascension_in_degrees = np.mod(np.rad2deg(right_ascension), 360)
 
         right_ascension_in_hours = right_ascension_in_degrees * (24.0 / 360.0)
 
         return right_ascension_in_hours
 
     def right_ascension_in_radians_to_hh_mm_ss(
-        self, right_ascension: float
-    ) -> List[float]:
+        self, right_ascension: np.ndarray
+    ) -> List[np.ndarray]:
         """
         Converts right_ascension in radians to hh:mm:ss.sss
 
         PAright_ascensionMETERS
+            right_ascension: float or array with right ascensions
 
         OUTPUTS
-            [hh, mm, ss]
+            [hh, mm, ss] with the shape of the input
                 hh: int value of hours
                 mm: int value of minutes
-                ss: int value of seconds
+                ss: float value of seconds
         """
 
         hours = self.right_ascension_in_radians_to_hours(right_ascension)
-        minutes = (hours - int(hours)) * 60.0
-        seconds = (minutes - int(minutes)) * 60
+        # np.modf returns fractional and integral parts
+        minutes, hours = np.modf(hours)
+        seconds, minutes = np.modf(minutes * 60.0)
+        seconds *= 60
 
-        hours, minutes = int(hours), int(minutes)
+        hours, minutes = hours.astype(int), minutes.astype(int)
         return [hours, minutes, seconds]
 
     @staticmethod
-    def declination_in_radians_to_dd_mm_ss(declination: float) -> List[float]:
+    def declination_in_radians_to_dd_mm_ss(
+        declination: np.ndarray,
+    ) -> List[np.ndarray]:
         """
         Converts declination in radians to dd:mm:ss.sss
 
         PAright_ascensionMETERS
+            declination: float or array with declinations
 
         OUTPUTS
-            [dd, mm, ss]
+            [dd, mm, ss] with the shape of the input
                 dd: int value of degrees
                 mm: int value of minutes
-                ss: int value of seconds
+                ss: float value of seconds
         """
         declination_in_degrees = np.rad2deg(declination)
 
-        if declination_in_degrees < 0:
-            declination_sign = -1
-            declination_in_degrees = abs(declination_in_degrees)
-        else:
-            declination_sign = 1
-
-        minutes = (declination_in_degrees - int(declination_in_degrees)) * 60.0
-
-        seconds = (minutes - int(minutes)) * 60
+        declination_sign = 1 - 2 * np.signbit(declination_in_degrees)
+        declination_in_degrees = np.abs(declination_in_degrees)
+        # np.modf returns fractional and integral parts
+        minutes, declination_in_degrees = np.modf(declination_in_degrees)
+        seconds, minutes = np.modf(minutes * 60.0)
+        seconds *= 60
 
         declination, minutes = [
-            declination_sign * int(declination_in_degrees),
-            int(minutes),
+            declination_sign * declination_in_degrees.astype(int),
+            minutes.astype(int),
         ]
 
         return [declination, minutes, seconds]
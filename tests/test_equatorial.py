@@ -0,0 +1,125 @@
+"""Check the vectorized J2000 RA and DEC against ephem"""
+import math
+import unittest
+
+import ephem
+import numpy as np
+
+from leosTrack.track.equatorial import (
+    get_apparent_to_j2000_transform,
+    get_local_sidereal_time,
+    radec_from_azalt,
+)
+from leosTrack.track.visible import (
+    PRESSURE,
+    TEMPERATURE,
+    TRANSFORM_TIME_DELTA,
+)
+
+###############################################################################
+# CONSTANTS
+# La Silla
+LATITUDE = math.radians(-29.256666666666668)
+LONGITUDE = math.radians(-70.73)
+# largest separation with ephem.Observer.radec_of in [arcsec]
+TOLERANCE = 1.0
+###############################################################################
+
+
+class TestRadecFromAzalt(unittest.TestCase):
+    """Compare radec_from_azalt with ephem.Observer.radec_of"""
+
+    def setUp(self):
+        """Grid of azimuth, altitude and epoch in [radians] and UTC"""
+
+        azimuth = np.radians(np.arange(0.0, 360.0, 30.0))
+        # both sides of the blend of refraction formulas at 15 degrees
+        altitude = np.radians([3.0, 10.0, 14.8, 15.2, 20.0, 45.0, 70.0, 89.0])
+        epochs = np.array(
+            [
+                "2015-03-20T06:00:00",
+                "2022-06-14T23:30:00",
+                "2024-01-01T00:00:00",
+                "2030-09-30T12:00:00",
+            ],
+            dtype="datetime64[s]",
+        )
+
+        [self.azimuth, self.altitude, self.date_time] = [
+            grid.ravel()
+            for grid in np.meshgrid(azimuth, altitude, epochs, indexing="ij")
+        ]
+
+        observer = ephem.Observer()
+        observer.epoch = "2000"
+        observer.pressure = PRESSURE
+        observer.temp = TEMPERATURE
+        observer.lat = LATITUDE
+        observer.lon = LONGITUDE
+        self.observer = observer
+
+    def get_separation(self, transform_date_time: np.ndarray) -> np.ndarray:
+        """
+        Separation between radec_from_azalt and ephem in [arcsec]
+
+        INPUTS
+            transform_date_time: time steps where the transform from
+                apparent RA and DEC to J2000 is evaluated
+
+        OUTPUTS
+            separation: one per point of the grid
+        """
+
+        [right_ascension, declination] = radec_from_azalt(
+            self.azimuth,
+            self.altitude,
+            sin_latitude=math.sin(LATITUDE),
+            cos_latitude=math.cos(LATITUDE),
+            local_sidereal_time=get_local_sidereal_time(
+                self.date_time, LONGITUDE
+            ),
+            apparent_to_j2000_transform=get_apparent_to_j2000_transform(
+                transform_date_time
+            ),
+            pressure=PRESSURE,
+            temperature=TEMPERATURE,
+        )
+
+        separation = np.empty(self.date_time.size)
+
+        for idx, date_time in enumerate(self.date_time.tolist()):
+
+            self.observer.date = ephem.Date(date_time)
+
+            ephem_coordinates = self.observer.radec_of(
+                self.azimuth[idx], self.altitude[idx]
+            )
+
+            separation[idx] = ephem.separation(
+                ephem_coordinates, (right_ascension[idx], declination[idx])
+            )
+
+        return np.degrees(separation) * 3600.0
+
+    def test_transform_at_each_time_step(self):
+        """Transform evaluated at the epoch of each direction"""
+
+        separation = self.get_separation(self.date_time)
+
+        self.assertLess(separation.max(), TOLERANCE)
+
+    def test_transform_on_coarse_grid(self):
+        """
+        Transform evaluated half of TRANSFORM_TIME_DELTA away, the
+        farthest a time step is from the grid of ComputeVisibility
+        """
+
+        half_time_delta = np.timedelta64(TRANSFORM_TIME_DELTA) // 2
+
+        separation = self.get_separation(self.date_time + half_time_delta)
+
+        self.assertLess(separation.max(), TOLERANCE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,6 @@
 """Spot visible LEO-sats with low resolution track"""
-import multiprocessing as mp
 import time
+from concurrent.futures import ThreadPoolExecutor
 from configparser import ConfigParser, ExtendedInterpolation
 
 from leosTrack.output import OutputFile
@@ -11,34 +11,32 @@ from leosTrack.track.fixtime import FixWindow
 from observatories import observatories
 
 ###############################################################################
+CONFIG_FILE_NAME = "track"
+###############################################################################
 
-if __name__ == "__main__":
-    ###########################################################################
-    start_time = time.time()
-    ###########################################################################
-    CONFIG_FILE_NAME = "track"
-    parser = ConfigParser(interpolation=ExtendedInterpolation())
-    parser.read(f"{CONFIG_FILE_NAME}.ini")
-    ###########################################################################
-    # Set output directory
-    satellite_brand = parser.get("observation", "satellite")
-    # observation date
-    time_parameters = parser.items("time")
-    time_parameters = dict(time_parameters)
 
-    year = int(time_parameters["year"])
-    month = int(time_parameters["month"])
-    day = int(time_parameters["day"])
-    window = time_parameters["window"]
+def fetch_tle(
+    parser: ConfigParser,
+    output_directory: str,
+    satellite_brand: str,
+    date: str,
+) -> list:
+    """
+    Download or locate the tle file, make its satellite entries unique
+    and get the list of satellites in it
 
-    date = f"{year}_{month:02d}_{day:02d}_{window}"
+    INPUTS
+        parser: parser of the configuration file
+        output_directory: directory set in the configuration file
+        satellite_brand: Name of satellite type, e.g, oneweb
+        date: observation date, e.g, "2022_06_14_evening"
 
-    # Set output directory
-    output_directory = parser.get("directory", "output")
-    ###########################################################################
-    # downloading tle file
-    print("Fetch TLE file", end="\n")
+    OUTPUTS
+        [tle_file_location, output_directory, satellites_list]
+            output_directory includes the subdirectory of the download
+    """
 
+    print("Fetch TLE file", end="\n")
 
     download_tle = parser.getboolean("tle", "download")
 
@@ -50,7 +48,7 @@ if __name__ == "__main__":
             satellite_brand=satellite_brand, tle_directory=output_directory
         )
 
-        tle_name, tle_time_stamp = tle.download()
+        tle_name, _ = tle.download()
 
     else:
 
@@ -68,36 +66,88 @@ if __name__ == "__main__":
     ###########################################################################
     print("Get list of satellites from TLE file", end="\n")
     satellites_list = tle.get_satellites_from_tle(f"{tle_file_location}")
+
+    return [tle_file_location, output_directory, satellites_list]
+
+
+###############################################################################
+
+
+def main() -> None:
+    """
+    Compute visibility of the satellites in the tle file over the
+    observation window set in track.ini and save the visible ones
+    """
+
     ###########################################################################
-    # reload to get it as a tuple again
-    print("Compute visibility of satellite", end="\n")
+    start_time = time.time()
+    ###########################################################################
+    parser = ConfigParser(interpolation=ExtendedInterpolation())
+    parser.read(f"{CONFIG_FILE_NAME}.ini")
+    ###########################################################################
+    # Set output directory
+    satellite_brand = parser.get("observation", "satellite")
+    # observation date
+    time_parameters = parser.items("time")
+    time_parameters = dict(time_parameters)
 
-    time_parameters = ConfigurationFile().section_to_dictionary(
-        parser.items("time")
-    )
+    year = int(time_parameters["year"])
+    month = int(time_parameters["month"])
+    day = int(time_parameters["day"])
+    window = time_parameters["window"]
 
-    observatory_name = parser.get("observation", "observatory")
-    observatory_data = observatories[f"{observatory_name}"]
+    date = f"{year}_{month:02d}_{day:02d}_{window}"
 
-    observations_constraints = ConfigurationFile().section_to_dictionary(
-        parser.items("observation")
-    )
+    # Set output directory
+    output_directory = parser.get("directory", "output")
+    ###########################################################################
+    # the tle file is fetched in a thread while the time steps and the
+    # sun position, which do not depend on it, are computed
+    with ThreadPoolExecutor(max_workers=1) as executor:
 
-    # compute_visibility = ComputeVisibility(
-    compute_visibility = FixWindow(
-        time_parameters=time_parameters,
-        observatory_data=observatory_data,
-        observation_constraints=observations_constraints,
-        tle_file_location=tle_file_location,
-    )
+        tle_future = executor.submit(
+            fetch_tle, parser, output_directory, satellite_brand, date
+        )
+        #######################################################################
+        # reload to get it as a tuple again
+        time_parameters = ConfigurationFile().section_to_dictionary(
+            parser.items("time")
+        )
 
-    number_processes = parser.getint("configuration", "processes")
+        observatory_name = parser.get("observation", "observatory")
+        observatory_data = observatories[f"{observatory_name}"]
 
-    with mp.Pool(processes=number_processes) as pool:
-        results = pool.map(
-            compute_visibility.compute_visibility_of_satellite, satellites_list
+        observations_constraints = ConfigurationFile().section_to_dictionary(
+            parser.items("observation")
         )
 
+        # compute_visibility = ComputeVisibility(
+        compute_visibility = FixWindow(
+            time_parameters=time_parameters,
+            observatory_data=observatory_data,
+            observation_constraints=observations_constraints,
+        )
+
+        [
+            tle_file_location,
+            output_directory,
+            satellites_list,
+        ] = tle_future.result()
+
+    compute_visibility.set_tle_lines(tle_file_location)
+    ###########################################################################
+    print("Compute visibility of satellite", end="\n")
+
+    number_processes = parser.getint("configuration", "processes")
+    chunksize = parser.getint("configuration", "chunksize", fallback=0)
+    pin_processes = parser.getboolean(
+        "configuration", "pin_processes", fallback=False
+    )
+
+    results = compute_visibility.compute_visibility_of_satellites(
+        satellites_list, number_processes, chunksize, pin_processes
+    )
+
     ###########################################################################
     # Get string formats for output files
     output = OutputFile(results, output_directory)
@@ -113,3 +163,8 @@ if __name__ == "__main__":
     ###########################################################################
     finish_time = time.time()
     print(f"Running time: {finish_time-start_time:.2f} [s]")
+
+
+###############################################################################
+if __name__ == "__main__":
+    main()